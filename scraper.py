@@ -1,14 +1,31 @@
 import argparse
+import asyncio
+import contextlib
 import csv
+import functools
+import graphlib
+import gzip
+import hashlib
+import importlib.util
+import itertools
+import json
+import multiprocessing
 import os
 import re
+import shelve
+import sys
 import time
-from dataclasses import dataclass
-from typing import Callable, Dict, List
-from urllib.parse import urljoin
+from collections import Counter, defaultdict
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
+from urllib.parse import urljoin, urlsplit
 
 import requests
 from bs4 import BeautifulSoup
+from bs4.dammit import UnicodeDammit
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 try:
     import pandas as pd  # noqa: F401  # optional dependency
@@ -16,6 +33,45 @@ except ImportError:
     pd = None
     # If pandas is unavailable, the script will fall back to pure CSV handling.
 
+try:
+    import pyarrow as pa  # optional dependency
+    import pyarrow.csv as pacsv
+except ImportError:
+    pa = pacsv = None
+    # Without pyarrow, merge parses raw CSVs with pandas' single-threaded reader.
+
+try:
+    from lxml import html as lxml_html  # optional dependency
+    HTML_PARSER = "lxml"
+except ImportError:
+    lxml_html = None
+    # lxml (libxml2) is several times faster; html.parser is the stdlib fallback.
+    HTML_PARSER = "html.parser"
+
+try:
+    from selectolax.lexbor import LexborHTMLParser  # optional dependency
+except ImportError:
+    LexborHTMLParser = None
+    # Without selectolax, site text extraction falls back to BeautifulSoup.
+
+try:
+    import re2  # optional dependency (google-re2)
+except ImportError:
+    re2 = None
+    # Without RE2, HQ pattern matching stays on the stdlib backtracking engine.
+
+try:
+    import aiohttp  # optional dependency
+except ImportError:
+    aiohttp = None
+    # Without aiohttp, enrichment fetches sites on a thread pool via requests.
+
+try:
+    import resource  # Unix only
+except ImportError:
+    resource = None
+    # Without resource (Windows), stage timings are logged without peak RSS.
+
 
 # ===============================
 # CONFIG
@@ -29,49 +85,36 @@ SEARCH_HEADERS = {
     "X-Subscription-Token": SEARCH_API_KEY,
 }
 
-# Curated search queries that target Devonshire’s niche
+# Brave caps `count` at 20 results per request; `offset` pages through up to 10 pages.
+SEARCH_PAGE_SIZE = 20
+# Pages fetched per fused query: at most 12 x 2 = 24 requests (the 32 single-phrase
+# queries they replaced cost 32) for up to 480 results. A short page ends a query's paging.
+SEARCH_PAGES = 2
+
+# Curated search queries that target Devonshire’s niche. Related phrasings are
+# fused with Brave's OR operator so each request covers a whole sub-niche.
 SEARCH_QUERIES = [
     # Financial-vertical MSPs
-    "managed IT services for hedge funds",
-    "hedge fund MSP New York",
-    "hedge fund IT support NYC",
-    "IT managed services for investment management firms",
-    "managed IT services for broker dealers",
-    "MSP for alternative investment firms",
-    "MSP for asset management industry",
-    "IT services for private equity firms",
+    "\"hedge fund\" (\"managed IT services\" OR MSP OR \"IT support\")",
+    "(\"managed IT services\" OR MSP OR \"IT services\") (\"investment management\" OR \"broker dealers\" OR \"alternative investment\")",
+    "(\"managed IT services\" OR MSP OR \"IT services\") (\"asset management\" OR \"private equity\")",
 
     # Market data ops / admin
-    "\"market data\" \"managed services\"",
-    "\"market data operations\" consulting",
-    "\"market data administration\" services",
-    "\"market data\" \"vendor management\" firm",
-    "\"market data\" \"exchange reporting\" services",
-    "\"market data\" cost optimization consultancy",
-    "\"market data\" inventory management consulting",
+    "\"market data operations\" OR \"market data administration\" OR (\"market data\" \"managed services\")",
+    "\"market data\" (\"vendor management\" OR \"exchange reporting\" OR \"cost optimization\" OR \"inventory management\")",
 
     # Trading infrastructure MSPs
-    "\"trading infrastructure\" \"managed services\"",
-    "\"low latency\" \"trading\" \"managed\"",
-    "\"ultra low latency\" \"trading\" \"infrastructure\"",
-    "\"exchange connectivity\" \"managed\"",
-    "\"colocation\" \"trading\" \"managed services\"",
+    "(\"trading infrastructure\" OR \"exchange connectivity\" OR colocation) \"managed services\"",
+    "(\"low latency\" OR \"ultra low latency\") trading (managed OR infrastructure)",
 
     # OMS/EMS/FIX services
-    "\"OMS implementation\" buy side consulting",
-    "\"EMS implementation\" trading",
-    "\"FIX connectivity\" consulting firm",
-    "\"FIX onboarding\" services",
-    "\"trading platform\" implementation consulting",
-    "\"order management system\" integration partner",
+    "\"OMS implementation\" OR \"EMS implementation\" OR \"trading platform implementation\"",
+    "(\"order management system\" integration) OR (\"FIX connectivity\" consulting) OR (\"FIX onboarding\" services)",
 
     # Reg-ops / compliance ops
-    "\"outsourced trade surveillance\"",
-    "\"managed\" \"trade surveillance\" services",
-    "\"outsourced compliance\" \"broker dealer\"",
-    "\"outsourced CCO\" services",
-    "\"best execution\" \"outsourced\" testing",
-    "\"regulatory reporting\" managed services",
+    "\"trade surveillance\" (outsourced OR managed) services",
+    "\"outsourced CCO\" OR (\"outsourced compliance\" \"broker dealer\")",
+    "(\"best execution\" outsourced testing) OR (\"regulatory reporting\" \"managed services\")",
 ]
 
 
@@ -79,20 +122,67 @@ SEARCH_QUERIES = [
 # UTILITIES
 # ===============================
 
-def safe_get(url: str, headers: Dict = None, timeout: int = 15, params: Dict = None) -> requests.Response:
-    """Wrapper around requests.get with basic exception handling and params support."""
+DEFAULT_HEADERS = {
+    # Use a browsery UA for sites that gate default clients.
+    "User-Agent": "Mozilla/5.0",
+    "Accept": "text/html,application/xhtml+xml,application/json;q=0.9,*/*;q=0.8",
+}
+
+# Fail fast on hosts that never accept a connection; reads get the longer budget.
+CONNECT_TIMEOUT = 3.05
+HTTP_TIMEOUT = (CONNECT_TIMEOUT, 15)
+
+# Transient statuses retried with exponential backoff (Retry-After wins when sent).
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+HTTP_RETRIES = 3
+HTTP_BACKOFF = 0.3
+
+# One pooled session for every stage so repeat hosts reuse TCP/TLS connections.
+# Plain-http firm sites get the same pooling and retries as https ones.
+_SESSION = requests.Session()
+_SESSION.headers.update(DEFAULT_HEADERS)
+_ADAPTER = HTTPAdapter(
+    pool_connections=32,
+    pool_maxsize=64,
+    max_retries=Retry(total=HTTP_RETRIES, backoff_factor=HTTP_BACKOFF, status_forcelist=RETRY_STATUSES),
+)
+_SESSION.mount("https://", _ADAPTER)
+_SESSION.mount("http://", _ADAPTER)
+
+
+def safe_get(url: str, headers: Dict = None, timeout=HTTP_TIMEOUT, params: Dict = None) -> requests.Response:
+    """Wrapper around the shared session's GET with basic exception handling and params support."""
     h = headers or {}
-    resp = requests.get(url, headers=h, timeout=timeout, params=params)
+    resp = _SESSION.get(url, headers=h, timeout=timeout, params=params)
     resp.raise_for_status()
     return resp
 
 
+def canon_host(host: str) -> str:
+    """Canonical host for dedup: lowercased, without port, trailing dot or leading 'www.'."""
+    h = host.lower().split(":")[0].rstrip(".")
+    return h[4:] if h.startswith("www.") else h
+
+
 def domain_from_url(url: str) -> str:
-    """Extract domain from URL."""
-    try:
-        return url.split("/")[2].lower()
-    except IndexError:
-        return url.lower()
+    """Extract domain from URL (see canon_host)."""
+    return canon_host(urlsplit(url).netloc or url)
+
+
+def canon_url(url: str) -> str:
+    """
+    Dedup key for a site URL: canonical host plus path/query, ignoring scheme,
+    fragment and a trailing '/'. So "https://www.x.com/" and "http://x.com"
+    collide, while distinct profile pages on one host stay distinct.
+    """
+    url = url.strip()
+    if not url:
+        return ""
+    parts = urlsplit(url if "//" in url else f"//{url}")
+    key = canon_host(parts.netloc) + parts.path.rstrip("/")
+    if parts.query:
+        key += f"?{parts.query}"
+    return key.lower()
 
 
 def normalize_url(href: str, base_url: str) -> str:
@@ -109,6 +199,16 @@ def normalize_url(href: str, base_url: str) -> str:
     return urljoin(base_url, href)
 
 
+# Title separators between headline and brand: | – — - :
+_SEP_RE = re.compile(r"\s*(?:\||–|—|-|:)\s*")
+
+_MARKETING_WORDS = {
+    "managed", "services", "service", "cloud", "it", "support", "cybersecurity",
+    "security", "hedge", "fund", "trading", "infrastructure", "platform",
+    "managed services", "consulting", "implementation", "solutions"
+}
+
+
 def clean_result_name(title: str, domain_fallback: str) -> str:
     """
     Strip common site-brand suffixes. Prefer returning the brand segment if it
@@ -122,9 +222,7 @@ def clean_result_name(title: str, domain_fallback: str) -> str:
         return domain_fallback
 
     # Normalize separators
-    separators = [r"\|", r"–", r"—", r"-", r":"]
-    pattern = r"\s*(?:%s)\s*" % "|".join(separators)
-    parts = re.split(pattern, title)
+    parts = _SEP_RE.split(title)
     parts = [p.strip() for p in parts if p.strip()]
 
     if not parts:
@@ -133,15 +231,9 @@ def clean_result_name(title: str, domain_fallback: str) -> str:
     base = parts[0]
     brand = parts[-1] if len(parts) > 1 else ""
 
-    marketing_words = {
-        "managed", "services", "service", "cloud", "it", "support", "cybersecurity",
-        "security", "hedge", "fund", "trading", "infrastructure", "platform",
-        "managed services", "consulting", "implementation", "solutions"
-    }
-
     def looks_like_marketing(text: str) -> bool:
         lower = text.lower()
-        return any(word in lower for word in marketing_words)
+        return any(word in lower for word in _MARKETING_WORDS)
 
     # If brand exists and is not marketing-heavy, prefer returning just the brand.
     if brand and len(brand.split()) <= 6 and not looks_like_marketing(brand):
@@ -155,6 +247,93 @@ def clean_result_name(title: str, domain_fallback: str) -> str:
     return base or domain_fallback
 
 
+# Column schema shared by every pipeline CSV.
+FIELDS = (
+    "Name", "Website", "HQ", "Category", "Fit (Core/Stretch)",
+    "Notes", "Source", "Conference", "Classification",
+)
+IDX = {name: i for i, name in enumerate(FIELDS)}
+
+
+# gzip level for `.csv.gz` intermediates: the fastest setting keeps most of the size win.
+GZIP_LEVEL = 1
+
+
+def open_text(path: str, mode: str = "r"):
+    """open() for pipeline CSVs; `.gz` paths are gzip-compressed transparently."""
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t", newline="", encoding="utf-8", compresslevel=GZIP_LEVEL)
+    return open(path, mode, newline="", encoding="utf-8")
+
+
+def iter_csv_rows(path: str) -> Iterator[List[str]]:
+    """
+    Stream a pipeline CSV as plain lists in FIELDS order (no per-row dicts).
+    Files with a different header are remapped; missing columns come back blank.
+    Blank lines are skipped and ragged rows padded/trimmed, as DictReader did.
+    """
+    width = len(FIELDS)
+    with open_text(path) as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if header is None:
+            return
+        if tuple(header) == FIELDS:
+            for row in reader:
+                if len(row) == width:
+                    yield row
+                elif row:
+                    yield (row + [""] * width)[:width]
+            return
+        pos = [header.index(name) if name in header else None for name in FIELDS]
+        for row in reader:
+            if row:
+                yield [row[p] if p is not None and p < len(row) else "" for p in pos]
+
+
+def read_csv_rows(path: str) -> List[List[str]]:
+    """Read a whole pipeline CSV; see iter_csv_rows()."""
+    return list(iter_csv_rows(path))
+
+
+def write_csv_rows(path: str, rows: List[List[str]]) -> None:
+    """Write FIELDS-ordered list rows with a header."""
+    with open_text(path, "w") as f:
+        writer = csv.writer(f)
+        writer.writerow(FIELDS)
+        writer.writerows(rows)
+
+
+def is_parquet(path: str) -> bool:
+    return path.endswith(".parquet")
+
+
+def read_rows(path: str) -> List[List[str]]:
+    """Like read_csv_rows, but `.parquet` paths are read through pandas."""
+    if not is_parquet(path):
+        return read_csv_rows(path)
+    df = pd.read_parquet(path).reindex(columns=list(FIELDS)).fillna("").astype(str)
+    return df.values.tolist()
+
+
+def iter_rows(path: str) -> Iterator[List[str]]:
+    """Like iter_csv_rows; `.parquet` files are loaded whole and then iterated."""
+    return iter(read_rows(path)) if is_parquet(path) else iter_csv_rows(path)
+
+
+def write_rows(path: str, rows: List[List[str]]) -> None:
+    """Like write_csv_rows, but `.parquet` paths are written through pandas."""
+    if not is_parquet(path):
+        write_csv_rows(path, rows)
+        return
+    pd.DataFrame(rows, columns=list(FIELDS)).to_parquet(path, index=False, compression="zstd")
+
+
+def write_dict_rows(path: str, rows: List[dict]) -> None:
+    """Write discovery rows (dicts keyed by FIELDS) as CSV or Parquet."""
+    write_rows(path, [[r.get(name, "") for name in FIELDS] for r in rows])
+
+
 def ensure_dir(path: str) -> None:
     """Ensure parent directory exists for a given file path."""
     directory = os.path.dirname(path)
@@ -162,77 +341,292 @@ def ensure_dir(path: str) -> None:
         os.makedirs(directory, exist_ok=True)
 
 
+def _stamp_path(out_path: str) -> str:
+    return f"{out_path}.stamp"
+
+
+def _read_stamp(out_path: str) -> dict:
+    """Parameters out_path was last built with; {} if it has no readable stamp."""
+    try:
+        with open(_stamp_path(out_path), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_stamp(out_path: str, params: dict) -> None:
+    ensure_dir(out_path)
+    with open(_stamp_path(out_path), "w", encoding="utf-8") as f:
+        json.dump(params, f, sort_keys=True)
+
+
+def _is_fresh(out_path: str, *input_paths: str, params: dict = None) -> bool:
+    """
+    True if out_path exists, is at least as new as every existing input, and
+    (when params is given) was built with the same params per its .stamp file.
+    With no inputs, any existing output counts as fresh.
+    """
+    if not os.path.exists(out_path):
+        return False
+    if params is not None and _read_stamp(out_path) != params:
+        return False
+    out_mtime = os.path.getmtime(out_path)
+    return all(os.path.getmtime(p) <= out_mtime for p in input_paths if os.path.exists(p))
+
+
+def _auto_chunksize(*paths: str) -> int:
+    """
+    Rows per chunk for streaming stages, from the combined size of the inputs
+    that exist. Bigger chunks mean more throughput but more memory.
+    """
+    size = sum(os.path.getsize(p) for p in paths if os.path.exists(p))
+    if size < 50 << 20:
+        return 5_000
+    if size < 500 << 20:
+        return 50_000
+    return 200_000
+
+
+def _skip_fresh(out_path: str) -> None:
+    print(f"[CACHE] {out_path} is up to date; skipping (use --force to rebuild).")
+
+
 # ===============================
 # DISCOVERY – WEB SEARCH
 # ===============================
 
-def search_web(query: str, count: int = 20, offset: int = 0) -> List[dict]:
-    """
-    Uses Brave Search API to execute a web search.
-    Returns a list of result dicts (title, url, description).
-    """
-    params = {
+# Result domains that are never firm sites; matched as substrings of the host.
+SEARCH_SKIP_DOMAINS = [
+    "linkedin.com", "indeed.com", "glassdoor.com", "facebook.com",
+    "twitter.com", "youtube.com", "wikipedia.org",
+]
+_SKIP_RE = re.compile("|".join(re.escape(d) for d in SEARCH_SKIP_DOMAINS))
+
+# Brave free tier allows 1 req/sec; queries are paced per request, not per batch.
+# The extra 0.1s keeps network jitter from landing two requests in one of Brave's seconds.
+SEARCH_MIN_INTERVAL = 1.1
+
+# Query results are reused for a day so reruns don't spend the search quota again.
+SEARCH_CACHE_PATH = "data/.search_cache"
+SEARCH_CACHE_TTL = 24 * 3600
+
+
+def _search_params(query: str, count: int, offset: int) -> dict:
+    return {
         "q": query,
         "count": count,
         "offset": offset,
         "search_lang": "en",
         "country": "us",
     }
-    resp = safe_get(SEARCH_ENDPOINT, headers=SEARCH_HEADERS, timeout=15, params=params)
+
+
+def search_web(query: str, count: int = SEARCH_PAGE_SIZE, offset: int = 0) -> List[dict]:
+    """
+    Uses Brave Search API to execute a web search.
+    Returns a list of result dicts (title, url, description).
+    """
+    params = _search_params(query, count, offset)
+    resp = safe_get(SEARCH_ENDPOINT, headers=SEARCH_HEADERS, params=params)
     data = resp.json()
     return data.get("web", {}).get("results", [])
 
 
-def run_search_discovery(output_csv: str = "data/firms_raw_search.csv", max_rows: int = None) -> None:
+async def search_web_async(session: "aiohttp.ClientSession", query: str, count: int = SEARCH_PAGE_SIZE, offset: int = 0) -> List[dict]:
+    """aiohttp variant of search_web(); error responses carry the first 500 chars of the body."""
+    params = _search_params(query, count, offset)
+    async with session.get(SEARCH_ENDPOINT, headers=SEARCH_HEADERS, params=params,
+                           timeout=aiohttp.ClientTimeout(total=15, sock_connect=CONNECT_TIMEOUT)) as resp:
+        if resp.status >= 400:
+            body = (await resp.text())[:500]
+            raise aiohttp.ClientResponseError(
+                resp.request_info, resp.history, status=resp.status,
+                message=f"{resp.reason} {body}", headers=resp.headers,
+            )
+        data = await resp.json()
+    return data.get("web", {}).get("results", [])
+
+
+def retry_delay(headers, attempt: int) -> float:
+    """Seconds to wait before retry `attempt` (0-based): Retry-After if numeric, else backoff."""
+    try:
+        return max(0.0, float(headers.get("Retry-After")))
+    except (TypeError, ValueError):
+        return HTTP_BACKOFF * 2 ** attempt
+
+
+def search_cache_key(query: str, offset: int = 0) -> str:
+    """Hash of the endpoint plus full request params, so changing either misses the cache."""
+    params = _search_params(query, SEARCH_PAGE_SIZE, offset)
+    return hashlib.sha256(json.dumps([SEARCH_ENDPOINT, params], sort_keys=True).encode()).hexdigest()
+
+
+def cached_search(cache, query: str, offset: int = 0) -> Optional[List[dict]]:
+    entry = cache.get(search_cache_key(query, offset))
+    if entry is None or time.time() - entry["at"] > SEARCH_CACHE_TTL:
+        return None
+    print(f"[SEARCH] Cached: {query}{_page_label(offset)}")
+    return entry["results"]
+
+
+def store_search(cache, query: str, offset: int, results: List[dict]) -> None:
+    cache[search_cache_key(query, offset)] = {"at": time.time(), "results": results}
+
+
+def _page_label(offset: int) -> str:
+    return f" (page {offset + 1})" if offset else ""
+
+
+class RequestPacer:
+    """Spaces request start times at least `interval` seconds apart; requests may still overlap."""
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._lock = asyncio.Lock()
+        self._next_start = 0.0
+
+    async def wait(self) -> None:
+        async with self._lock:
+            now = time.monotonic()
+            if self._next_start > now:
+                await asyncio.sleep(self._next_start - now)
+                now = self._next_start
+            self._next_start = now + self.interval
+
+
+def report_search_error(query: str, e: Exception) -> None:
+    body = ""
+    if isinstance(e, requests.HTTPError) and e.response is not None:
+        try:
+            body = e.response.text[:500]
+        except Exception:
+            body = ""
+    print(f"[!] Search error for query '{query}': {e} {body}".rstrip())
+
+
+def search_queries(queries: List[str], on_results: Callable[[str, List[dict]], bool], cache=None) -> None:
+    """
+    Fetch up to SEARCH_PAGES pages per query, one request per SEARCH_MIN_INTERVAL,
+    and hand each page to on_results() in order; stops once it returns True.
+    """
+    cache = {} if cache is None else cache
+    for q in queries:
+        for offset in range(SEARCH_PAGES):
+            results = cached_search(cache, q, offset)
+            fetched = results is None
+            if fetched:
+                print(f"[SEARCH] Query: {q}{_page_label(offset)}")
+                try:
+                    results = search_web(q, offset=offset)
+                except Exception as e:
+                    report_search_error(q, e)
+                    break
+                store_search(cache, q, offset, results)
+            if on_results(q, results):
+                return
+            if fetched:
+                time.sleep(SEARCH_MIN_INTERVAL)
+            if len(results) < SEARCH_PAGE_SIZE:
+                break
+
+
+async def search_queries_async(queries: List[str], on_results: Callable[[str, List[dict]], bool],
+                               cache=None, prefetch: bool = True) -> None:
+    """
+    Async search_queries(): requests are paced at SEARCH_MIN_INTERVAL but may
+    overlap, and transient errors (429/5xx) are retried like the requests
+    session does. Pages reach on_results() in query order; a page is only
+    requested once the query's previous page came back full. Stops (cancelling
+    unsent requests) once on_results() returns True; with prefetch=False each
+    request waits for the previous page to be handled, so a stop spends no
+    quota on pages that get thrown away. Fresh hits in `cache` skip the
+    request and the pacing.
+    """
+    cache = {} if cache is None else cache
+    pacer = RequestPacer(SEARCH_MIN_INTERVAL)
+    jobs = [(q, offset) for q in queries for offset in range(SEARCH_PAGES)]
+    handled = [asyncio.Event() for _ in jobs]
+    tasks: List[asyncio.Task] = []
+    async with aiohttp.ClientSession(headers=DEFAULT_HEADERS) as session:
+        async def fetch(q: str, offset: int) -> List[dict]:
+            for attempt in range(HTTP_RETRIES + 1):
+                await pacer.wait()
+                print(f"[SEARCH] Query: {q}{_page_label(offset)}")
+                try:
+                    return await search_web_async(session, q, offset=offset)
+                except aiohttp.ClientResponseError as e:
+                    if e.status not in RETRY_STATUSES or attempt == HTTP_RETRIES:
+                        raise
+                    await asyncio.sleep(retry_delay(e.headers or {}, attempt))
+
+        async def run(i: int) -> List[dict]:
+            q, offset = jobs[i]
+            if offset:
+                try:
+                    if len(await tasks[i - 1]) < SEARCH_PAGE_SIZE:
+                        return []
+                except Exception:
+                    return []  # already reported against the earlier page
+            if not prefetch and i:
+                await handled[i - 1].wait()
+            results = cached_search(cache, q, offset)
+            if results is not None:
+                return results
+            results = await fetch(q, offset)
+            store_search(cache, q, offset, results)
+            return results
+
+        tasks.extend(asyncio.create_task(run(i)) for i in range(len(jobs)))
+        try:
+            for i, (q, _) in enumerate(jobs):
+                try:
+                    results = await tasks[i]
+                except Exception as e:
+                    report_search_error(q, e)
+                else:
+                    if on_results(q, results):
+                        break
+                handled[i].set()
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+
+def run_search_discovery(output_csv: str = "data/firms_raw_search.csv", max_rows: int = None,
+                         cache_path: Optional[str] = SEARCH_CACHE_PATH) -> None:
     """
     Executes search-based discovery and writes unique website rows into CSV.
+    Query results are memoized in cache_path for SEARCH_CACHE_TTL; None disables it.
     Schema:
         Name, Website, HQ, Category, Fit (Core/Stretch), Notes, Source, Conference, Classification
     """
     ensure_dir(output_csv)
     seen_domains = set()
     rows = []
-    total_rows = 0
-
-    for q in SEARCH_QUERIES:
-        print(f"[SEARCH] Query: {q}")
-        try:
-            results = search_web(q, count=20)
-        except requests.HTTPError as e:
-            body = ""
-            if e.response is not None:
-                try:
-                    body = e.response.text[:500]
-                except Exception:
-                    body = ""
-            print(f"[!] Search error for query '{q}': {e} {body}")
-            continue
-        except Exception as e:
-            print(f"[!] Search error for query '{q}': {e}")
-            continue
 
+    def add_results(q: str, results: List[dict]) -> bool:
+        """Append unseen domains from one query; True once max_rows is reached."""
         for r in results:
             url = r.get("url")
             if not url:
                 continue
             domain = domain_from_url(url)
+            # Dedup on the bare domain, but keep the host the result actually used.
+            host = urlsplit(url).hostname or domain
             name = clean_result_name(r.get("title"), domain)
             snippet = r.get("description", "")
 
             # Basic filters to avoid noise
-            if any(skip in domain for skip in [
-                "linkedin.com", "indeed.com", "glassdoor.com", "facebook.com",
-                "twitter.com", "youtube.com", "wikipedia.org"
-            ]):
+            if _SKIP_RE.search(domain):
                 continue
             if domain in seen_domains:
                 continue
 
             seen_domains.add(domain)
-            total_rows += 1
             rows.append({
                 "Name": name or domain,
-                "Website": f"https://{domain}",
+                "Website": f"https://{host}",
                 "HQ": "",
                 "Category": "",
                 "Fit (Core/Stretch)": "",
@@ -242,32 +636,23 @@ def run_search_discovery(output_csv: str = "data/firms_raw_search.csv", max_rows
                 "Classification": "",
             })
 
-            if total_rows % 25 == 0:
-                print("[SEARCH] Reached 25-row batch; sleeping 30s for throttling...")
-                time.sleep(30)
-
-            if max_rows and total_rows >= max_rows:
+            if max_rows and len(rows) >= max_rows:
                 print(f"[SEARCH] Reached max_rows={max_rows}; stopping search discovery.")
-                break
-
-        if max_rows and total_rows >= max_rows:
-            break
+                return True
+        return False
 
-        print("[SEARCH] Sleeping 5s between queries for rate limiting...")
-        time.sleep(5)
+    with open_cache(cache_path) as cache:
+        if aiohttp is not None:
+            # Without a row cap nothing stops early, so requests can run ahead of parsing.
+            asyncio.run(search_queries_async(SEARCH_QUERIES, add_results, cache, prefetch=not max_rows))
+        else:
+            search_queries(SEARCH_QUERIES, add_results, cache)
 
     if not rows:
         print("[SEARCH] No rows discovered.")
         return
 
-    fieldnames = [
-        "Name", "Website", "HQ", "Category", "Fit (Core/Stretch)",
-        "Notes", "Source", "Conference", "Classification"
-    ]
-    with open(output_csv, "w", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        writer.writeheader()
-        writer.writerows(rows)
+    write_dict_rows(output_csv, rows)
 
     print(f"[SEARCH] Wrote {len(rows)} rows to {output_csv}")
 
@@ -280,12 +665,12 @@ def run_search_discovery(output_csv: str = "data/firms_raw_search.csv", max_rows
 class ConferenceConfig:
     name: str                # e.g., "FIA_Expo_2024"
     url: str                 # exhibitor listing URL
-    parser: Callable         # function(html: str, conf_name: str) -> List[dict]
+    parser: Callable         # function(html: str, conf_name: str, remaining: int = None) -> List[dict]
 
 
 def fetch_html(url: str) -> str:
-    # Use a browsery UA for sites that gate default clients.
-    resp = safe_get(url, headers={"User-Agent": "Mozilla/5.0"})
+    # The shared session already sends a browsery UA.
+    resp = safe_get(url)
     return resp.text
 
 
@@ -318,14 +703,85 @@ def fetch_html_headless(url: str, wait_selector: str = None, wait_ms: int = 3000
     return html
 
 
-def parse_fia_expo(html: str, conf_name: str) -> List[dict]:
+FIA_EXPO_BASE = "https://s7.goeshow.com/fia/expo/2024/"
+
+
+def lxml_root(html: str):
+    """Parse an HTML string with lxml; None for empty documents."""
+    if not html or not html.strip():
+        return None
+    try:
+        return lxml_html.fromstring(html)
+    except ValueError:
+        # str input carrying an XML encoding declaration; let lxml read bytes.
+        return lxml_html.fromstring(html.encode("utf-8"))
+
+
+def lxml_text(el, sep: str = "") -> str:
+    """Same as BeautifulSoup's get_text(sep, strip=True) for an lxml element."""
+    return sep.join(t.strip() for t in el.itertext() if t.strip())
+
+
+def fia_profile_url(href: str, onclick: str) -> str:
+    """Build a profile URL from an exhibitor link's href or onclick popup call."""
+    if href and href.startswith("http"):
+        return href
+    if href and "profile.cfm" in href:
+        return urljoin(FIA_EXPO_BASE, href)
+    if onclick and "profile.cfm" in onclick:
+        m = re.search(r"ExhibitorPopup\('([^']+)", onclick)
+        if m:
+            return urljoin(FIA_EXPO_BASE, m.group(1))
+    return ""
+
+
+def fia_expo_row(booth: str, name: str, profile_url: str, conf_name: str) -> dict:
+    return {
+        "Name": name,
+        "Website": profile_url,
+        "HQ": "",
+        "Category": "",
+        "Fit (Core/Stretch)": "",
+        "Notes": f"Booth: {booth}" if booth else "",
+        "Source": f"conf:{conf_name}",
+        "Conference": conf_name,
+        "Classification": "",
+    }
+
+
+def parse_fia_expo(html: str, conf_name: str, remaining: int = None) -> List[dict]:
     """
     Parser for FIA Expo sponsor/exhibitor list:
     https://s7.goeshow.com/fia/expo/2024/sponsor_exhibitor_list.cfm
+    With lxml installed, rows and cells come straight from XPath without
+    building a BeautifulSoup tree. Stops after `remaining` rows if given.
     """
-    soup = BeautifulSoup(html, "html.parser")
     rows = []
 
+    if lxml_html is not None:
+        root = lxml_root(html)
+        if root is None:
+            return rows
+        tbodies = root.xpath("//table[@id='exh_list']//tbody")
+        if not tbodies:
+            return rows
+        for tr in tbodies[0].iter("tr"):
+            tds = list(tr.iter("td"))
+            if len(tds) < 2:
+                continue
+            name = lxml_text(tds[1], " ")
+            if not name:
+                continue
+            link = next(tds[1].iter("a"), None)
+            profile_url = ""
+            if link is not None:
+                profile_url = fia_profile_url(link.get("href", ""), link.get("onclick", ""))
+            rows.append(fia_expo_row(lxml_text(tds[0]), name, profile_url, conf_name))
+            if remaining is not None and len(rows) >= remaining:
+                break
+        return rows
+
+    soup = BeautifulSoup(html, HTML_PARSER)
     table = soup.select_one("table#exh_list tbody")
     if not table:
         return rows
@@ -337,51 +793,75 @@ def parse_fia_expo(html: str, conf_name: str) -> List[dict]:
         booth = tds[0].get_text(strip=True)
         name_cell = tds[1]
         name = name_cell.get_text(" ", strip=True)
+        if not name:
+            continue
         # Attempt to construct a profile URL from href or onclick
         profile_url = ""
         link = name_cell.find("a")
         if link:
-            href = link.get("href", "")
-            onclick = link.get("onclick", "")
-            if href and href.startswith("http"):
-                profile_url = href
-            elif href and "profile.cfm" in href:
-                profile_url = urljoin("https://s7.goeshow.com/fia/expo/2024/", href)
-            elif onclick and "profile.cfm" in onclick:
-                m = re.search(r"ExhibitorPopup\\('([^']+)", onclick)
-                if m:
-                    profile_url = urljoin("https://s7.goeshow.com/fia/expo/2024/", m.group(1))
-
-        if not name:
-            continue
-        rows.append({
-            "Name": name,
-            "Website": profile_url,
-            "HQ": "",
-            "Category": "",
-            "Fit (Core/Stretch)": "",
-            "Notes": f"Booth: {booth}" if booth else "",
-            "Source": f"conf:{conf_name}",
-            "Conference": conf_name,
-            "Classification": "",
-        })
+            profile_url = fia_profile_url(link.get("href", ""), link.get("onclick", ""))
+        rows.append(fia_expo_row(booth, name, profile_url, conf_name))
+        if remaining is not None and len(rows) >= remaining:
+            break
 
     return rows
 
 
-def parse_tradetech_fx(html: str, conf_name: str) -> List[dict]:
+def tradetech_row(name: str, url: str, notes: str, conf_name: str) -> dict:
+    return {
+        "Name": name,
+        "Website": url,
+        "HQ": "",
+        "Category": "",
+        "Fit (Core/Stretch)": "",
+        "Notes": notes,
+        "Source": f"conf:{conf_name}",
+        "Conference": conf_name,
+        "Classification": "",
+    }
+
+
+def tradetech_url(href: str) -> str:
+    if href.startswith("http"):
+        return href
+    if href.startswith("www"):
+        return f"https://{href}"
+    return ""
+
+
+def _xpath_has_class(cls: str) -> str:
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {cls} ')"
+
+
+def parse_tradetech_fx(html: str, conf_name: str, remaining: int = None) -> List[dict]:
     """
     Parser for TradeTech FX USA sponsors/exhibitors.
     Target URL (2025 sponsors page):
         https://tradetechfxus.wbresearch.com/sponsors/2025
+    Stops after `remaining` rows if given.
     """
-    soup = BeautifulSoup(html, "html.parser")
     rows: List[dict] = []
 
     # The page uses rows with the "sponsor" class for each sponsor entry.
-    cards = soup.select("div.sponsor")
+    if lxml_html is not None:
+        root = lxml_root(html)
+        if root is None:
+            return rows
+        for c in root.xpath(f"//div[{_xpath_has_class('sponsor')}]"):
+            name_el = next(c.iter("h3"), None)
+            if name_el is None:
+                continue
+            links = c.xpath(".//a[@href]")
+            descs = c.xpath(f".//*[{_xpath_has_class('description')}]")
+            url = tradetech_url(links[0].get("href")) if links else ""
+            notes = lxml_text(descs[0], " ") if descs else ""
+            rows.append(tradetech_row(lxml_text(name_el), url, notes, conf_name))
+            if remaining is not None and len(rows) >= remaining:
+                break
+        return rows
 
-    for c in cards:
+    soup = BeautifulSoup(html, HTML_PARSER)
+    for c in soup.select("div.sponsor"):
         name_el = c.select_one("h3")
         link_el = c.find("a", href=True)
         desc_el = c.select_one(".description")
@@ -389,29 +869,11 @@ def parse_tradetech_fx(html: str, conf_name: str) -> List[dict]:
         if not name_el:
             continue
 
-        name = name_el.get_text(strip=True)
-
-        url = ""
-        if link_el and link_el.get("href"):
-            href = link_el["href"]
-            if href.startswith("http"):
-                url = href
-            elif href.startswith("www"):
-                url = f"https://{href}"
-
+        url = tradetech_url(link_el["href"]) if link_el else ""
         notes = desc_el.get_text(" ", strip=True) if desc_el else ""
-
-        rows.append({
-            "Name": name,
-            "Website": url,
-            "HQ": "",
-            "Category": "",
-            "Fit (Core/Stretch)": "",
-            "Notes": notes,
-            "Source": f"conf:{conf_name}",
-            "Conference": conf_name,
-            "Classification": "",
-        })
+        rows.append(tradetech_row(name_el.get_text(strip=True), url, notes, conf_name))
+        if remaining is not None and len(rows) >= remaining:
+            break
 
     return rows
 
@@ -451,7 +913,8 @@ def run_conference_scrape(output_csv: str = "data/firms_raw_conferences.csv", ma
         print(f"[CONF] Scraping {conf.name} from {conf.url}")
         try:
             html = fetch_html(conf.url)
-            rows = conf.parser(html, conf.name)
+            remaining = max_rows - len(all_rows) if max_rows else None
+            rows = conf.parser(html, conf.name, remaining)
             all_rows.extend(rows)
             print(f"[CONF] {conf.name}: {len(rows)} exhibitors scraped")
             if max_rows and len(all_rows) >= max_rows:
@@ -462,21 +925,11 @@ def run_conference_scrape(output_csv: str = "data/firms_raw_conferences.csv", ma
         if max_rows and len(all_rows) >= max_rows:
             break
 
-    if max_rows and len(all_rows) > max_rows:
-        all_rows = all_rows[:max_rows]
-
     if not all_rows:
         print("[CONF] No exhibitors scraped; check URLs and selectors.")
         return
 
-    fieldnames = [
-        "Name", "Website", "HQ", "Category", "Fit (Core/Stretch)",
-        "Notes", "Source", "Conference", "Classification"
-    ]
-    with open(output_csv, "w", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        writer.writeheader()
-        writer.writerows(all_rows)
+    write_dict_rows(output_csv, all_rows)
 
     print(f"[CONF] Wrote {len(all_rows)} rows to {output_csv}")
 
@@ -570,7 +1023,7 @@ DIR_SOURCES: List[DirectorySource] = [
 
 
 def parse_cme_licensed_distributors(html: str, src: DirectorySource) -> List[dict]:
-    soup = BeautifulSoup(html, "html.parser")
+    soup = BeautifulSoup(html, HTML_PARSER)
     rows = []
     seen = set()
     # This page is mostly a list of vendor <a> tags; filter out obvious nav/social links.
@@ -607,7 +1060,7 @@ def parse_cme_licensed_distributors(html: str, src: DirectorySource) -> List[dic
 
 
 def parse_cme_ebs_vendor_partners(html: str, src: DirectorySource) -> List[dict]:
-    soup = BeautifulSoup(html, "html.parser")
+    soup = BeautifulSoup(html, HTML_PARSER)
     rows = []
     seen = set()
     # Partner headings are h2/h3 with <a> inside; collect following siblings as description.
@@ -646,7 +1099,7 @@ def parse_cme_ebs_vendor_partners(html: str, src: DirectorySource) -> List[dict]
 
 
 def parse_isitc_member_firms(html: str, src: DirectorySource) -> List[dict]:
-    soup = BeautifulSoup(html, "html.parser")
+    soup = BeautifulSoup(html, HTML_PARSER)
     rows = []
     header = None
     for h in soup.find_all(["h1", "h2", "h3"]):
@@ -682,7 +1135,7 @@ def parse_isitc_member_firms(html: str, src: DirectorySource) -> List[dict]:
 
 
 def parse_fix_member_firms(html: str, src: DirectorySource) -> List[dict]:
-    soup = BeautifulSoup(html, "html.parser")
+    soup = BeautifulSoup(html, HTML_PARSER)
     rows = []
     seen = set()
     for item in soup.select("div.item"):
@@ -714,7 +1167,7 @@ def parse_fix_member_firms(html: str, src: DirectorySource) -> List[dict]:
 
 
 def parse_goeshow_table(html: str, src: DirectorySource) -> List[dict]:
-    soup = BeautifulSoup(html, "html.parser")
+    soup = BeautifulSoup(html, HTML_PARSER)
     rows = []
     table = soup.find("table")
     if not table:
@@ -748,7 +1201,7 @@ def parse_goeshow_table(html: str, src: DirectorySource) -> List[dict]:
 
 
 def parse_wbresearch_sponsors(html: str, src: DirectorySource) -> List[dict]:
-    soup = BeautifulSoup(html, "html.parser")
+    soup = BeautifulSoup(html, HTML_PARSER)
     rows = []
     seen = set()
     cards = soup.select("div.sponsor")
@@ -796,7 +1249,7 @@ def parse_cme_tvs(html: str, src: DirectorySource) -> List[dict]:
     The page appears to be highly dynamic; we attempt to capture any links that
     contain 'technology-vendor-services/' and treat them as vendor pages.
     """
-    soup = BeautifulSoup(html, "html.parser")
+    soup = BeautifulSoup(html, HTML_PARSER)
     rows = []
     seen = set()
     links = set()
@@ -827,7 +1280,7 @@ def parse_sifma_sources(html: str, src: DirectorySource) -> List[dict]:
     """
     Attempt to scrape SIFMA Sources cards; structure may be JS-driven so this may return few/none.
     """
-    soup = BeautifulSoup(html, "html.parser")
+    soup = BeautifulSoup(html, HTML_PARSER)
     rows = []
     seen = set()
     cards = soup.select("div.company-card, div.card, div.listing")
@@ -866,7 +1319,7 @@ def parse_sifma_sources(html: str, src: DirectorySource) -> List[dict]:
 
 
 def parse_advent_alliance(html: str, src: DirectorySource) -> List[dict]:
-    soup = BeautifulSoup(html, "html.parser")
+    soup = BeautifulSoup(html, HTML_PARSER)
     rows = []
     seen = set()
     # Look for cards that may hold partner info; if none, fallback to anchor links in main content.
@@ -913,7 +1366,7 @@ def parse_advent_alliance(html: str, src: DirectorySource) -> List[dict]:
 
 
 def parse_advent_portfolio_data(html: str, src: DirectorySource) -> List[dict]:
-    soup = BeautifulSoup(html, "html.parser")
+    soup = BeautifulSoup(html, HTML_PARSER)
     rows = []
     seen = set()
     table = soup.find("table")
@@ -1018,14 +1471,7 @@ def run_directory_scrape(output_csv: str = "data/firms_raw_directories.csv", max
         print("[DIR] No directory rows scraped.")
         return
 
-    fieldnames = [
-        "Name", "Website", "HQ", "Category", "Fit (Core/Stretch)",
-        "Notes", "Source", "Conference", "Classification"
-    ]
-    with open(output_csv, "w", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        writer.writeheader()
-        writer.writerows(all_rows)
+    write_dict_rows(output_csv, all_rows)
 
     print(f"[DIR] Wrote {len(all_rows)} rows to {output_csv}")
 
@@ -1066,6 +1512,69 @@ REG_OPS_KEYWORDS = [
     "outsourced compliance", "regulatory reporting", "finra", "sec rule",
 ]
 
+
+KEYWORD_GROUPS: Dict[str, List[str]] = {
+    "finance": FINANCE_KEYWORDS,
+    "msp": MSP_KEYWORDS,
+    "trading": TRADING_INFRA_KEYWORDS,
+    "market_data": MARKET_DATA_KEYWORDS,
+    "oms": OMS_EMS_KEYWORDS,
+    "reg": REG_OPS_KEYWORDS,
+}
+
+# Words keep inner hyphens so "broker-dealer" stays one token; a slash only joins
+# digit runs ("24/7"), so "oms/ems" and "data/entitlements" still split into words.
+_TOKEN_RE = re.compile(r"\d+/\d+|[a-z0-9]+(?:-[a-z0-9]+)*")
+
+
+def _fold_token(token: str) -> str:
+    """Drop a plural 's' so "hedge funds" still hits "hedge fund"."""
+    if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+        return token[:-1]
+    return token
+
+
+def _keyword_key(keyword: str) -> str:
+    return " ".join(_fold_token(t) for t in _TOKEN_RE.findall(keyword))
+
+
+def _build_keyword_index():
+    """Map each folded keyword n-gram to the groups that own it."""
+    owners = defaultdict(list)
+    for group, kws in KEYWORD_GROUPS.items():
+        for kw in kws:
+            owners[_keyword_key(kw)].append(group)
+    return {key: tuple(groups) for key, groups in owners.items()}
+
+
+KEYWORD_INDEX = _build_keyword_index()
+# Multi-word keywords: their first tokens and the longest n-gram we need to build.
+_NGRAM_HEADS = {key.split(" ", 1)[0] for key in KEYWORD_INDEX if " " in key}
+_MAX_NGRAM = max(key.count(" ") + 1 for key in KEYWORD_INDEX)
+
+
+def keyword_hits(text: str) -> Dict[str, int]:
+    """
+    Distinct keywords present in `text`, counted per KEYWORD_GROUPS entry.
+    Tokenizes once, then does set lookups instead of a substring scan per keyword.
+    """
+    raw = _TOKEN_RE.findall(text)
+    tokens = [_fold_token(t) for t in raw]
+    grams = set(tokens)
+    for t in raw:
+        if "-" in t:
+            # Parts of a compound count too, so "oms-ems" hits both "oms" and "ems".
+            grams.update(_fold_token(part) for part in t.split("-"))
+    for i, tok in enumerate(tokens):
+        if tok in _NGRAM_HEADS:
+            for n in range(2, _MAX_NGRAM + 1):
+                grams.add(" ".join(tokens[i:i + n]))
+    counts = Counter({group: 0 for group in KEYWORD_GROUPS})
+    for key in grams & KEYWORD_INDEX.keys():
+        counts.update(KEYWORD_INDEX[key])
+    return counts
+
+
 # Known overrides for Financial MSPs (force category/fit)
 KNOWN_FINANCIAL_MSPS = {
     "ceutechnologies.com",
@@ -1084,92 +1593,221 @@ KNOWN_COMP_NAMES = {
 }
 
 
-def fetch_site_text(url: str) -> str:
+# Tags whose text feeds classification; footer/address surface location hints.
+SITE_TEXT_TAGS = ["p", "li", "h1", "h2", "h3", "footer", "address"]
+
+
+_CHARSET_RE = re.compile(r"charset=[\"']?([\w.:-]+)", re.I)
+
+
+def http_charset(headers) -> Optional[str]:
+    """Charset declared in the Content-Type header, if any."""
+    m = _CHARSET_RE.search(headers.get("Content-Type", ""))
+    return m.group(1) if m else None
+
+
+def extract_site_text(body: bytes, charset: Optional[str] = None) -> str:
+    """
+    Concatenate the text of SITE_TEXT_TAGS into one lowercased string.
+    Uses selectolax (Lexbor) when installed; only flat text is needed here, so
+    building a full BeautifulSoup tree is wasted work.
+
+    `charset` is the HTTP-declared encoding; otherwise <meta charset> and byte
+    sniffing decide, the same way for both parsers.
+
+    Matches nested inside another match (a <p> in a <footer>, menu <li>s inside
+    <li>s) are skipped: the outer node's text already contains them.
+    """
+    if LexborHTMLParser is not None:
+        # Lexbor reads bytes as UTF-8 regardless of the page's declared charset.
+        markup = UnicodeDammit(body, [charset] if charset else [], is_html=True).unicode_markup
+        tree = LexborHTMLParser(markup or "")
+        nodes = tree.css(",".join(SITE_TEXT_TAGS))
+        matched = {n.mem_id for n in nodes}
+
+        def nested(n) -> bool:
+            parent = n.parent
+            while parent is not None:
+                if parent.mem_id in matched:
+                    return True
+                parent = parent.parent
+            return False
+
+        return " ".join(n.text(separator=" ", strip=True) for n in nodes if not nested(n)).lower()
+    # Hand the parser raw bytes so it does charset detection without a Python-side decode.
+    soup = BeautifulSoup(body, HTML_PARSER, from_encoding=charset)
+    nodes = soup.find_all(SITE_TEXT_TAGS)
+    return " ".join(
+        t.get_text(separator=" ", strip=True) for t in nodes if t.find_parent(SITE_TEXT_TAGS) is None
+    ).lower()
+
+
+# Only the first chunk of a page is parsed; marketing sites can be multi-MB and the
+# text we classify on sits well within this.
+MAX_PAGE_BYTES = 512 * 1024
+
+# Per-URL validators + extracted text, so re-runs can revalidate instead of re-download.
+ENRICH_CACHE_PATH = "data/.enrich_cache"
+
+
+def conditional_headers(cached: Optional[dict]) -> Dict[str, str]:
+    """If-None-Match / If-Modified-Since headers for a cached page entry."""
+    headers = {}
+    if cached:
+        if cached.get("etag"):
+            headers["If-None-Match"] = cached["etag"]
+        if cached.get("last_modified"):
+            headers["If-Modified-Since"] = cached["last_modified"]
+    return headers
+
+
+def is_html_response(headers) -> bool:
+    """False for responses that declare a non-HTML Content-Type (PDFs, images, ...)."""
+    ctype = headers.get("Content-Type", "").lower()
+    return not ctype or "html" in ctype
+
+
+def page_cache_entry(headers, text: str) -> Optional[dict]:
+    """Cache entry for a fresh 200, or None if the server sent no validators."""
+    etag = headers.get("ETag", "")
+    last_modified = headers.get("Last-Modified", "")
+    if not etag and not last_modified:
+        return None
+    return {"etag": etag, "last_modified": last_modified, "text": text, "ts": time.time()}
+
+
+def fetch_site_page(
+    url: str, cached: Optional[dict] = None, pool: Optional[Executor] = None
+) -> Tuple[str, Optional[dict]]:
+    """
+    Conditional GET for a firm site. Returns (text, cache entry); a 304 reuses
+    the cached text without parsing anything. With a pool (see parse_pool()),
+    text extraction runs there instead of on the calling thread.
+    """
     try:
-        resp = safe_get(url, timeout=10)
+        # Stream so we can stop at MAX_PAGE_BYTES; gzip/br decoding still applies.
+        with _SESSION.get(url, headers=conditional_headers(cached), timeout=(CONNECT_TIMEOUT, 10), stream=True) as resp:
+            if resp.status_code == 304 and cached:
+                return cached["text"], cached
+            resp.raise_for_status()
+            if not is_html_response(resp.headers):
+                return "", None
+            chunks, size = [], 0
+            for chunk in resp.iter_content(chunk_size=64 * 1024):
+                chunks.append(chunk)
+                size += len(chunk)
+                if size >= MAX_PAGE_BYTES:
+                    break
+            headers = resp.headers
     except Exception:
-        return ""
-    soup = BeautifulSoup(resp.text, "html.parser")
-    text_parts = []
-    # Include footer/address to surface location hints.
-    for t in soup.find_all(["p", "li", "h1", "h2", "h3", "footer", "address"]):
-        text_parts.append(t.get_text(separator=" ", strip=True))
-    return " ".join(text_parts).lower()
+        return "", None
+    # One join into the bytes handed to the parser; no intermediate copies.
+    body = b"".join(chunks)[:MAX_PAGE_BYTES]
+    charset = http_charset(headers)
+    text = pool.submit(extract_site_text, body, charset).result() if pool else extract_site_text(body, charset)
+    return text, page_cache_entry(headers, text)
 
 
-def classify_category(text: str) -> str:
-    # Count keyword hits instead of just "any"
-    finance_hits = sum(1 for k in FINANCE_KEYWORDS if k in text)
-    msp_hits = sum(1 for k in MSP_KEYWORDS if k in text)
-    trading_hits = sum(1 for k in TRADING_INFRA_KEYWORDS if k in text)
-    md_hits = sum(1 for k in MARKET_DATA_KEYWORDS if k in text)
-    oms_hits = sum(1 for k in OMS_EMS_KEYWORDS if k in text)
-    reg_hits = sum(1 for k in REG_OPS_KEYWORDS if k in text)
-
-    score = {
-        "Financial MSP": 0,
-        "Trading Infra MSP": 0,
-        "Market Data Ops": 0,
-        "OMS/EMS & FIX": 0,
-        "RegOps / Surveillance": 0,
-        "Generic IT": 0,
-    }
+def fetch_site_text(url: str) -> str:
+    """Uncached text of one firm site; enrichment itself goes through fetch_site_page()."""
+    return fetch_site_page(url)[0]
+
+
+CATEGORIES = (
+    "Financial MSP",
+    "Trading Infra MSP",
+    "Market Data Ops",
+    "OMS/EMS & FIX",
+    "RegOps / Surveillance",
+    "Generic IT",
+)
+# Order of the hit counts fed to the weight table; the trailing 1 carries constants.
+_SCORE_GROUPS = ("finance", "msp", "trading", "market_data", "oms", "reg")
+
+
+def _score_weights(mask: int) -> Tuple[Tuple[int, ...], ...]:
+    """
+    Per-category weights over (finance, msp, trading, market_data, oms, reg, 1)
+    for one hit mask. Bits 0-5 flag groups with hits, bit 6 is "2+ OMS hits",
+    bit 7 is "fx" in the text.
+    """
+    fin, msp, trading, md, oms, reg, oms_multi, fx = ((mask >> b) & 1 for b in range(8))
+    w = {cat: [0] * 7 for cat in CATEGORIES}
 
     # --- Financial MSP ---
     # Finance + MSP together is the classic hedge-fund/PE MSP pattern.
-    if finance_hits > 0 and msp_hits > 0:
-        score["Financial MSP"] += finance_hits * 3 + msp_hits * 2
-    elif finance_hits > 0:
-        score["Financial MSP"] += finance_hits * 2
-    elif msp_hits > 0:
+    if fin and msp:
+        w["Financial MSP"][0:2] = [3, 2]
+    elif fin:
+        w["Financial MSP"][0] = 2
+    elif msp:
         # MSP but no explicit finance – light score, may end up as Generic IT
-        score["Financial MSP"] += msp_hits
-
-    # --- Trading Infra MSP ---
-    if trading_hits > 0:
-        score["Trading Infra MSP"] += trading_hits * 3
+        w["Financial MSP"][1] = 1
 
-    # --- Market Data Ops ---
-    if md_hits > 0:
-        score["Market Data Ops"] += md_hits * 3
+    w["Trading Infra MSP"][2] = 3
+    w["Market Data Ops"][3] = 3
+    w["RegOps / Surveillance"][5] = 3
 
     # --- OMS/EMS & FIX ---
     # Be stricter: require at least 2 hits, or 1 hit + strong trading/FX language.
-    if oms_hits >= 2:
-        score["OMS/EMS & FIX"] += oms_hits * 3
-    elif oms_hits == 1 and (trading_hits > 0 or md_hits > 0 or "fx" in text):
-        score["OMS/EMS & FIX"] += 3
-
-    # --- RegOps / Surveillance ---
-    if reg_hits > 0:
-        score["RegOps / Surveillance"] += reg_hits * 3
+    if oms_multi or trading or md or fx:
+        w["OMS/EMS & FIX"][4] = 3
 
     # --- Generic IT ---
     # Only use Generic IT when it looks like a plain MSP (msp_hits) with no clear niche.
-    if (
-        msp_hits > 0
-        and finance_hits == 0
-        and trading_hits == 0
-        and md_hits == 0
-        and oms_hits == 0
-        and reg_hits == 0
-    ):
-        score["Generic IT"] = 1
+    if msp and not (fin or trading or md or oms or reg):
+        w["Generic IT"][6] = 1
+
+    return tuple(tuple(w[cat]) for cat in CATEGORIES)
+
 
-    # Pick best scoring category
-    cat = max(score, key=score.get)
+# Scoring rules resolved once per hit mask, so classify_category is a table lookup
+# plus one dot product per category.
+_SCORE_WEIGHTS = tuple(_score_weights(mask) for mask in range(1 << 8))
 
-    # If everything is zero, fall back to Generic IT
-    if score[cat] == 0:
-        cat = "Generic IT"
+
+def classify_category(text: str) -> str:
+    # Count keyword hits instead of just "any"
+    hits = keyword_hits(text)
+    counts = [hits[g] for g in _SCORE_GROUPS]
+    mask = sum((c > 0) << b for b, c in enumerate(counts))
+    mask |= (hits["oms"] >= 2) << 6 | ("fx" in text) << 7
+    counts.append(1)
+
+    scores = [sum(w * c for w, c in zip(row, counts)) for row in _SCORE_WEIGHTS[mask]]
+
+    # Pick best scoring category; if everything is zero, fall back to Generic IT
+    best = max(range(len(CATEGORIES)), key=scores.__getitem__)
+    cat = CATEGORIES[best] if scores[best] else "Generic IT"
 
     # Final override: if finance + MSP signals are strong, don’t let a stray OMS/EMS hit steal it
-    if finance_hits > 0 and msp_hits > 0 and score["Financial MSP"] >= score[cat]:
+    if mask & 0b11 == 0b11 and scores[0] >= scores[best]:
         cat = "Financial MSP"
 
     return cat
 
 
+# "headquartered in / based in / headquarters in City, ST" in one alternation.
+# The lookahead lets matches overlap, so a greedy "based in ..." capture can't
+# hide a later "headquartered in ..." phrase.
+_HQ_RE = re.compile(r"(?=(headquartered|based|headquarters) in ([a-z ,]+,\s*[a-z]{2}))")
+# Phrase priority when several appear: earlier entries win regardless of position.
+_HQ_PHRASE_PRIORITY = {"headquartered": 0, "based": 1, "headquarters": 2}
+
+_US_STATES = (
+    "al|ak|az|ar|ca|co|ct|de|fl|ga|hi|id|il|in|ia|ks|ky|la|me|md|ma|mi|mn|ms|mo|mt|"
+    "ne|nv|nh|nj|nm|ny|nc|nd|oh|ok|or|pa|ri|sc|sd|tn|tx|ut|vt|va|wa|wv|wi|wy"
+)
+_GENERIC_US_PATTERN = rf"\b([a-z][a-z .]{{2,40}}),\s*({_US_STATES})(?:\s+\d{{5}})?\b"
+_GENERIC_US_RE = re.compile(_GENERIC_US_PATTERN)
+# RE2 matches in guaranteed linear time, but its \s and \b are ASCII-only. Spell
+# out Python's ASCII whitespace set and only use it on ASCII text, where both agree.
+_GENERIC_US_RE2 = (
+    re2.compile(_GENERIC_US_PATTERN.replace(r"\s", r"[\t\n\v\f\r \x1c-\x1f]"))
+    if re2 is not None else None
+)
+
+
 def guess_hq(text: str) -> str:
     """
     Rough HQ guesser that looks for:
@@ -1180,21 +1818,22 @@ def guess_hq(text: str) -> str:
     t = text.lower()
 
     # 1) Explicit "Headquartered in ..." or "Based in ..."
-    hq_patterns = [
-        r"headquartered in ([a-z ,]+,\s*[a-z]{2})",
-        r"based in ([a-z ,]+,\s*[a-z]{2})",
-        r"headquarters in ([a-z ,]+,\s*[a-z]{2})",
-    ]
-    for pat in hq_patterns:
-        m = re.search(pat, t)
-        if m:
-            loc = m.group(1).strip()
-            parts = [p.strip() for p in loc.split(",")]
-            if len(parts) == 2:
-                city = parts[0].title()
-                st = parts[1].upper()
-                return f"{city}, {st}"
-            return loc.title()
+    # Single scan; keep the first location per phrase, best phrase wins.
+    best = None
+    for m in _HQ_RE.finditer(t):
+        rank = _HQ_PHRASE_PRIORITY[m.group(1)]
+        if best is None or rank < best[0]:
+            best = (rank, m.group(2))
+            if rank == 0:
+                break
+    if best:
+        loc = best[1].strip()
+        parts = [p.strip() for p in loc.split(",")]
+        if len(parts) == 2:
+            city = parts[0].title()
+            st = parts[1].upper()
+            return f"{city}, {st}"
+        return loc.title()
 
     # 2) Known hubs (removed overly-generic 'la')
     hub_map = [
@@ -1228,12 +1867,8 @@ def guess_hq(text: str) -> str:
             return label
 
     # 3) Generic US pattern: "City, ST [ZIP]"
-    states = (
-        "al|ak|az|ar|ca|co|ct|de|fl|ga|hi|id|il|in|ia|ks|ky|la|me|md|ma|mi|mn|ms|mo|mt|"
-        "ne|nv|nh|nj|nm|ny|nc|nd|oh|ok|or|pa|ri|sc|sd|tn|tx|ut|vt|va|wa|wv|wi|wy"
-    )
-    generic_us = rf"\b([a-z][a-z .]{{2,40}}),\s*({states})(?:\s+\d{{5}})?\b"
-    m = re.search(generic_us, t)
+    generic_us = _GENERIC_US_RE2 if _GENERIC_US_RE2 is not None and t.isascii() else _GENERIC_US_RE
+    m = generic_us.search(t)
     if m:
         city = m.group(1).strip().title()
         st = m.group(2).upper()
@@ -1251,7 +1886,7 @@ def classify_fit(category: str) -> str:
     return "Core"
 
 
-def classify_firm(row: dict) -> str:
+def classify_firm(category: str, fit: str) -> str:
     """
     High-level classification:
     - Potential acquisition target (near-term) if Core & in key lanes
@@ -1264,7 +1899,7 @@ def classify_firm(row: dict) -> str:
         "OMS/EMS & FIX",
         "RegOps / Surveillance",
     }
-    if row.get("Fit (Core/Stretch)") == "Core" and row.get("Category") in core_lanes:
+    if fit == "Core" and category in core_lanes:
         return "Potential acquisition target (near-term)"
     return "Pattern / Comp / Future Partner"
 
@@ -1286,7 +1921,226 @@ def normalize_hq(hq: str) -> str:
     return hq.title()
 
 
-def enrich(input_csv: str, output_csv: str) -> None:
+# What enrichment keeps from a fetched page: (category, HQ guess). Much smaller
+# than the page text, so it can be held for every site in a run.
+SiteFacts = Tuple[str, str]
+
+
+def site_facts(text: str) -> SiteFacts:
+    return classify_category(text), guess_hq(text)
+
+
+def apply_site_facts(row: List[str], facts: SiteFacts) -> List[str]:
+    """Fill Category, Fit, HQ and Classification on a FIELDS-ordered row from its site's facts."""
+    category, hq_guess = facts
+    domain = domain_from_url(row[IDX["Website"]].strip())
+    fit = classify_fit(category)
+
+    hq = row[IDX["HQ"]].strip() or hq_guess
+
+    # Domain-based overrides for known financial MSPs
+    if domain in KNOWN_FINANCIAL_MSPS:
+        category = "Financial MSP"
+        fit = "Core"
+
+    row[IDX["Category"]] = category
+    row[IDX["Fit (Core/Stretch)"]] = fit
+    row[IDX["HQ"]] = normalize_hq(hq)
+    name_l = row[IDX["Name"]].strip().lower()
+    if name_l in KNOWN_COMP_NAMES:
+        row[IDX["Classification"]] = "Pattern / Comp / Future Partner"
+    else:
+        row[IDX["Classification"]] = classify_firm(category, fit)
+    return row
+
+
+# Input rows enriched per batch when the rows are already in memory; file inputs
+# are sized by _auto_chunksize(). Bounds rows, fetch tasks and page text in memory.
+ENRICH_CHUNK_SIZE = 500
+
+
+# enrich() input: a pipeline file path, or FIELDS-ordered rows already in memory.
+EnrichInput = Union[str, Iterable[List[str]]]
+
+
+def iter_enrich_input(input_csv: EnrichInput, chunk_size: int = ENRICH_CHUNK_SIZE) -> Iterator[List[List[str]]]:
+    """Stream rows that have a Website to fetch, chunk_size rows at a time."""
+    site = IDX["Website"]
+    source = iter_rows(input_csv) if isinstance(input_csv, str) else input_csv
+    rows = (row for row in source if row[site].strip())
+    while True:
+        chunk = list(itertools.islice(rows, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+@contextlib.contextmanager
+def open_enriched(output_csv: str):
+    """csv.writer for the enriched output, header already written."""
+    with open(output_csv, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(FIELDS)
+        yield writer
+
+
+def open_cache(cache_path: Optional[str]):
+    """Open an on-disk shelve cache; a None path gives a throwaway in-memory dict."""
+    if not cache_path:
+        return contextlib.nullcontext({})
+    ensure_dir(cache_path)
+    return shelve.open(cache_path)
+
+
+# Max in-flight site fetches during enrichment, overall and against any one host.
+ENRICH_CONCURRENCY = 32
+ENRICH_PER_HOST = 4
+
+# Enriched rows are handed to the CSV writer in batches of this many.
+ENRICH_FLUSH_EVERY = 500
+
+# Page parsing is CPU-bound, so it gets its own processes while fetches stay concurrent.
+ENRICH_PARSE_WORKERS = max(2, (os.cpu_count() or 1) - 1)
+# Spawned workers each re-import this module, so small runs parse in-process.
+ENRICH_POOL_MIN_PAGES = 64
+
+
+def parse_pool() -> ProcessPoolExecutor:
+    """
+    Process pool for extract_site_text(). Workers are spawned rather than forked
+    because enrich() runs alongside threads and an event loop.
+    """
+    return ProcessPoolExecutor(max_workers=ENRICH_PARSE_WORKERS, mp_context=multiprocessing.get_context("spawn"))
+
+
+def parse_pool_for(stack: contextlib.ExitStack, pool: Optional[Executor], pages: int) -> Optional[Executor]:
+    """
+    Parse pool for a chunk with `pages` new pages: the running one if any, else a
+    new parse_pool() entered on `stack` once pages reach ENRICH_POOL_MIN_PAGES,
+    else None (parse in-process).
+    """
+    if pool is None and pages >= ENRICH_POOL_MIN_PAGES:
+        pool = stack.enter_context(parse_pool())
+    return pool
+
+
+def fetch_keys(urls: List[str]) -> Tuple[List[str], Dict[str, str]]:
+    """
+    canon_url key for each URL, plus the first URL seen per key. Rows sharing a
+    key (e.g. "http://www.x.com" and "https://x.com/") are fetched once per run.
+    """
+    keys = [canon_url(url) or url for url in urls]
+    first: Dict[str, str] = {}
+    for key, url in zip(keys, urls):
+        first.setdefault(key, url)
+    return keys, first
+
+
+def interleave_hosts(pairs: List[Tuple[str, str]]) -> List[Tuple[str, str]]:
+    """
+    Reorder (key, url) pairs round-robin across hosts, so consecutive fetches
+    rarely hit the same server and one slow or rate-limiting host can't hog
+    the front of the queue. Order within a host is kept.
+    """
+    by_host: Dict[str, List[Tuple[str, str]]] = defaultdict(list)
+    for key, url in pairs:
+        by_host[domain_from_url(url)].append((key, url))
+    return [pair for wave in itertools.zip_longest(*by_host.values()) for pair in wave if pair is not None]
+
+
+async def fetch_site_page_async(
+    session: "aiohttp.ClientSession", url: str, cached: Optional[dict] = None, pool: Optional[Executor] = None
+) -> Tuple[str, Optional[dict]]:
+    """aiohttp variant of fetch_site_page()."""
+    try:
+        async with session.get(url, headers=conditional_headers(cached),
+                               timeout=aiohttp.ClientTimeout(total=10, sock_connect=CONNECT_TIMEOUT)) as resp:
+            if resp.status == 304 and cached:
+                return cached["text"], cached
+            resp.raise_for_status()
+            if not is_html_response(resp.headers):
+                return "", None
+            chunks, size = [], 0
+            while size < MAX_PAGE_BYTES:
+                chunk = await resp.content.read(MAX_PAGE_BYTES - size)
+                if not chunk:
+                    break
+                chunks.append(chunk)
+                size += len(chunk)
+            headers = resp.headers
+    except Exception:
+        return "", None
+    body = b"".join(chunks)
+    charset = http_charset(headers)
+    if pool is None:
+        text = extract_site_text(body, charset)
+    else:
+        text = await asyncio.get_running_loop().run_in_executor(pool, extract_site_text, body, charset)
+    return text, page_cache_entry(headers, text)
+
+
+async def enrich_async(
+    input_csv: EnrichInput, output_csv: str, cache_path: Optional[str] = ENRICH_CACHE_PATH,
+    chunk_size: int = ENRICH_CHUNK_SIZE,
+) -> None:
+    """
+    Async driver for enrich(): works through the input chunk_size rows at a
+    time, fetching each chunk's sites concurrently (bounded by ENRICH_CONCURRENCY,
+    ENRICH_PER_HOST per host) and streaming classified rows to the output as
+    their fetches finish, keeping input order.
+    """
+    ensure_dir(output_csv)
+    chunks = iter_enrich_input(input_csv, chunk_size)
+    head = next(chunks, None)
+    if head is None:
+        print("[ENRICH] No rows to write.")
+        return
+
+    sem = asyncio.Semaphore(ENRICH_CONCURRENCY)
+    # Per canon_url key, so a site repeated in a later chunk isn't fetched again.
+    facts: Dict[str, SiteFacts] = {}
+    written = 0
+
+    pool: Optional[Executor] = None
+    with open_cache(cache_path) as cache, contextlib.ExitStack() as stack:
+        async def bounded(session: "aiohttp.ClientSession", url: str) -> SiteFacts:
+            async with sem:
+                print(f"[ENRICH] Fetching {url}")
+                text, entry = await fetch_site_page_async(session, url, cache.get(url), pool)
+                if entry:
+                    cache[url] = entry
+                return site_facts(text)
+
+        connector = aiohttp.TCPConnector(limit=ENRICH_CONCURRENCY, limit_per_host=ENRICH_PER_HOST,
+                                         ttl_dns_cache=300)
+        async with aiohttp.ClientSession(connector=connector, headers=DEFAULT_HEADERS) as session:
+            with open_enriched(output_csv) as writer:
+                for rows in itertools.chain([head], chunks):
+                    keys, first = fetch_keys([row[IDX["Website"]].strip() for row in rows])
+                    new = interleave_hosts([(k, u) for k, u in first.items() if k not in facts])
+                    pool = parse_pool_for(stack, pool, len(new))
+                    # The semaphore is FIFO, so creation order is the fetch order.
+                    tasks = {key: asyncio.create_task(bounded(session, url)) for key, url in new}
+                    # Every fetch in the chunk is already in flight; awaiting in row
+                    # order writes each finished prefix while the rest still download.
+                    buf: List[List[str]] = []
+                    for row, key in zip(rows, keys):
+                        if key not in facts:
+                            facts[key] = await tasks[key]
+                        buf.append(apply_site_facts(row, facts[key]))
+                        if len(buf) >= ENRICH_FLUSH_EVERY:
+                            writer.writerows(buf)
+                            buf.clear()
+                    writer.writerows(buf)
+                    written += len(rows)
+
+    print(f"[ENRICH] Wrote {written} enriched rows to {output_csv}")
+
+
+def enrich(
+    input_csv: EnrichInput, output_csv: str, cache_path: Optional[str] = ENRICH_CACHE_PATH,
+    chunk_size: Optional[int] = None,
+) -> None:
     """
     Enriches firms:
         - Fetches website text
@@ -1296,142 +2150,240 @@ def enrich(input_csv: str, output_csv: str) -> None:
 
     Assumes input CSV has:
         Name, Website, HQ, Category, Fit (Core/Stretch), Notes, Source, Conference, Classification
+    input_csv may also be rows already in FIELDS order, e.g. straight from
+    merge_raw_sources(return_rows=True), which skips the file round-trip.
+
+    Fetches run concurrently via enrich_async() when aiohttp is installed,
+    otherwise on a thread pool over the shared requests session (socket I/O
+    releases the GIL). Either way, once a chunk has ENRICH_POOL_MIN_PAGES pages
+    to fetch, page parsing moves to a spawned process pool; scripts that import
+    this module and enrich that much must call enrich() under
+    `if __name__ == "__main__":`, as spawned workers re-import the caller.
+    Pages are revalidated against cache_path with conditional GETs, so
+    unchanged sites come back as 304s (None disables). Rows whose websites
+    share a canon_url key share a single fetch, and fetches are issued
+    round-robin across hosts (output keeps input order).
+
+    The input is streamed chunk_size rows at a time and each chunk is written
+    out before the next is read, so only the per-site facts outlive a chunk.
+    chunk_size defaults to _auto_chunksize() for files, ENRICH_CHUNK_SIZE for rows.
     """
-    ensure_dir(output_csv)
-    rows_out: List[dict] = []
+    if chunk_size is None:
+        chunk_size = _auto_chunksize(input_csv) if isinstance(input_csv, str) else ENRICH_CHUNK_SIZE
+    if aiohttp is not None:
+        asyncio.run(enrich_async(input_csv, output_csv, cache_path, chunk_size))
+        return
 
-    with open(input_csv, newline="", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            url = row.get("Website", "").strip()
-            if not url:
-                continue
+    ensure_dir(output_csv)
+    chunks = iter_enrich_input(input_csv, chunk_size)
+    head = next(chunks, None)
+    if head is None:
+        print("[ENRICH] No rows to write.")
+        return
 
-            domain = domain_from_url(url)
+    facts: Dict[str, SiteFacts] = {}
+    written = 0
 
+    # The shelve cache is only touched from this thread.
+    parsers: Optional[Executor] = None
+    with open_cache(cache_path) as cache, contextlib.ExitStack() as stack, \
+            ThreadPoolExecutor(max_workers=ENRICH_CONCURRENCY) as pool, open_enriched(output_csv) as writer:
+        def fetch(url: str, cached: Optional[dict]) -> Tuple[str, Optional[dict]]:
             print(f"[ENRICH] Fetching {url}")
-            text = fetch_site_text(url)
-            category = classify_category(text)
-            fit = classify_fit(category)
-
-            hq = row.get("HQ", "").strip()
-            if not hq:
-                hq_guess = guess_hq(text)
-                if hq_guess:
-                    hq = hq_guess
-
-            # Domain-based overrides for known financial MSPs
-            if domain in KNOWN_FINANCIAL_MSPS:
-                category = "Financial MSP"
-                fit = "Core"
-
-            row["Category"] = category
-            row["Fit (Core/Stretch)"] = fit
-            row["HQ"] = normalize_hq(hq)
-            name_l = row.get("Name", "").strip().lower()
-            if name_l in KNOWN_COMP_NAMES:
-                row["Classification"] = "Pattern / Comp / Future Partner"
-            else:
-                row["Classification"] = classify_firm(row)
+            return fetch_site_page(url, cached, parsers)
 
-            rows_out.append(row)
+        for rows in itertools.chain([head], chunks):
+            keys, first = fetch_keys([row[IDX["Website"]].strip() for row in rows])
+            new = interleave_hosts([(key, url) for key, url in first.items() if key not in facts])
+            parsers = parse_pool_for(stack, parsers, len(new))
+            urls = [url for _, url in new]
+            cached = [cache.get(url) for url in urls]
+            for (key, url), (text, entry) in zip(new, pool.map(fetch, urls, cached)):
+                if entry:
+                    cache[url] = entry
+                facts[key] = site_facts(text)
 
-    if not rows_out:
-        print("[ENRICH] No rows to write.")
-        return
+            writer.writerows(apply_site_facts(row, facts[key]) for row, key in zip(rows, keys))
+            written += len(rows)
 
-    fieldnames = [
-        "Name", "Website", "HQ", "Category", "Fit (Core/Stretch)",
-        "Notes", "Source", "Conference", "Classification"
-    ]
-    with open(output_csv, "w", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        writer.writeheader()
-        writer.writerows(rows_out)
-
-    print(f"[ENRICH] Wrote {len(rows_out)} enriched rows to {output_csv}")
+    print(f"[ENRICH] Wrote {written} enriched rows to {output_csv}")
 
 
 # ===============================
 # MERGING SOURCES
 # ===============================
 
+# Raw CSVs at least this big are parsed whole by pyarrow's threaded reader, in
+# MERGE_BLOCK_SIZE blocks; smaller ones stream through pandas chunk by chunk,
+# keeping peak memory at one chunk and letting max_total_rows stop the read early.
+MERGE_ARROW_MIN_BYTES = 64 << 20
+MERGE_BLOCK_SIZE = 1 << 20
+
+# pandas' default na_values, so both readers blank the same cells.
+_CSV_NA_VALUES = [
+    "", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan", "1.#IND", "1.#QNAN",
+    "<NA>", "N/A", "NA", "NULL", "NaN", "None", "n/a", "nan", "null",
+]
+
+
+def iter_csv_frames(path: str, chunk_size: int):
+    """
+    Yield a raw CSV as DataFrames of up to chunk_size rows of string columns.
+    Files of MERGE_ARROW_MIN_BYTES or more are parsed up front by pyarrow's
+    multithreaded reader and then sliced; the rest, or any file pyarrow rejects
+    (e.g. short rows, which pandas pads), stream through pandas.
+    """
+    if pacsv is not None and os.path.getsize(path) >= MERGE_ARROW_MIN_BYTES:
+        with open_text(path) as f:
+            header = next(csv.reader(f), None)
+        if not header:
+            return
+        try:
+            # open_csv() would stream, but it always parses on one thread.
+            table = pacsv.read_csv(
+                path,
+                read_options=pacsv.ReadOptions(use_threads=True, block_size=MERGE_BLOCK_SIZE),
+                # Notes can hold quoted line breaks.
+                parse_options=pacsv.ParseOptions(newlines_in_values=True),
+                convert_options=pacsv.ConvertOptions(
+                    column_types={name: pa.string() for name in header},
+                    null_values=_CSV_NA_VALUES, strings_can_be_null=True,
+                ),
+            )
+        except pa.ArrowInvalid as e:
+            print(f"[MERGE] pyarrow could not parse {path} ({e}); reading it with pandas.")
+        else:
+            for batch in table.to_batches(max_chunksize=chunk_size):
+                yield batch.to_pandas()
+            return
+    yield from pd.read_csv(path, dtype=str, chunksize=chunk_size)
+
+
 def merge_raw_sources(
     search_csv: str = "data/firms_raw_search.csv",
     conf_csv: str = "data/firms_raw_conferences.csv",
     dir_csv: str = "data/firms_raw_directories.csv",
-    output_csv: str = "data/firms_raw_all.csv",
+    output_csv: Optional[str] = "data/firms_raw_all.csv",
     max_total_rows: int = None,
-) -> None:
+    return_rows: bool = False,
+    chunk_size: Optional[int] = None,
+) -> Optional[List[List[str]]]:
     """
     Merge search-discovered and conference-discovered firms into one CSV.
-    Deduplicate on Website. Uses pandas if available, otherwise falls back to CSV.
+    Deduplicate on Website. Uses pandas if available, streaming each source in
+    chunks (see iter_csv_frames); otherwise falls back to CSV.
+    With return_rows, the merged rows are also returned in FIELDS order so enrich()
+    can take them directly; output_csv=None then skips writing the file.
+    chunk_size (rows) defaults to _auto_chunksize() over the sources.
     """
-    ensure_dir(output_csv)
-    fieldnames = [
-        "Name", "Website", "HQ", "Category", "Fit (Core/Stretch)",
-        "Notes", "Source", "Conference", "Classification"
-    ]
+    if output_csv is not None:
+        ensure_dir(output_csv)
+    dest = output_csv or "memory"
+    fieldnames = list(FIELDS)
 
     if pd is not None:
-        frames = []
+        paths = []
         for path in (search_csv, conf_csv, dir_csv):
             if not os.path.exists(path):
                 print(f"[MERGE] File not found, skipping: {path}")
                 continue
-            df = pd.read_csv(path, dtype=str).fillna("")
-            frames.append(df)
+            paths.append(path)
 
-        if not frames:
+        if not paths:
             print("[MERGE] No rows to merge.")
             return
 
-        merged = pd.concat(frames, ignore_index=True)
-        if "Website" not in merged.columns:
-            merged["Website"] = ""
-
-        merged["website_norm"] = merged["Website"].astype(str).str.strip().str.lower()
-
-        for col in fieldnames:
-            if col not in merged.columns:
-                merged[col] = ""
-
-        with_site = merged[merged["website_norm"] != ""].copy()
-        without_site = merged[merged["website_norm"] == ""].copy()
-
-        with_site = with_site.drop_duplicates(subset=["website_norm"])
-        without_site = without_site.drop_duplicates(subset=["Name"])
+        chunk_size = chunk_size or _auto_chunksize(*paths)
+        cap = max_total_rows if max_total_rows is not None and max_total_rows > 0 else None
+        written = 0
+        truncated = False
+        seen_keys = set()
+        # Rows without a website go after all website rows, deduplicated on Name.
+        # They are rare, so they are the only rows held until the end.
+        without_site = []
+        seen_names = set()
+        # Parquet can't be appended to, so its output is collected and written once,
+        # as are rows handed back to the caller.
+        write_parquet = output_csv is not None and is_parquet(output_csv)
+        write_csv = output_csv is not None and not write_parquet
+        parts = []
+
+        def append(rows) -> None:
+            nonlocal written, truncated
+            if cap is not None and written + len(rows) > cap:
+                rows = rows.head(cap - written)
+                truncated = True
+            if write_parquet or return_rows:
+                parts.append(rows)
+            if write_csv:
+                # Appends to a .gz output add gzip members, which every reader concatenates.
+                with open_text(output_csv, "a") as f:
+                    rows.to_csv(f, header=False, index=False)
+            written += len(rows)
+
+        if write_csv:
+            with open_text(output_csv, "w") as f:
+                pd.DataFrame(columns=fieldnames).to_csv(f, index=False)
+        for path in paths:
+            if is_parquet(path):
+                chunks = [pd.read_parquet(path)]
+            else:
+                chunks = iter_csv_frames(path, chunk_size)
+            for chunk in chunks:
+                # Project onto the schema once (adds missing columns, drops extras) and
+                # blank the NaN holes left by empty cells.
+                chunk = chunk.reindex(columns=fieldnames).fillna("")
+
+                # Dedup key lives in a side Series, so no helper column to add and drop.
+                website_norm = chunk["Website"].astype(str).map(canon_url)
+                has_site = website_norm.ne("")
+
+                keys = website_norm[has_site]
+                keys = keys[~keys.duplicated() & ~keys.isin(seen_keys)]
+                seen_keys.update(keys)
+                append(chunk.loc[keys.index])
+
+                names = chunk.loc[~has_site, "Name"]
+                names = names[~names.duplicated() & ~names.isin(seen_names)]
+                seen_names.update(names)
+                without_site.append(chunk.loc[names.index])
+                if truncated:
+                    break
+            if truncated:
+                break
 
-        merged = pd.concat([with_site, without_site], ignore_index=True)
-        merged = merged[fieldnames + ["website_norm"]]
-        merged = merged.drop(columns=["website_norm"])
+        if not truncated and without_site:
+            append(pd.concat(without_site))
+        if write_parquet:
+            merged = pd.concat(parts) if parts else pd.DataFrame(columns=fieldnames)
+            merged.to_parquet(output_csv, index=False, compression="zstd")
 
-        if max_total_rows is not None and max_total_rows > 0 and len(merged) > max_total_rows:
-            merged = merged.head(max_total_rows)
+        if truncated:
             print(f"[MERGE] Truncated merged rows to {max_total_rows} per max_total_rows limit.")
-
-        merged.to_csv(output_csv, index=False, encoding="utf-8")
-        print(f"[MERGE] Merged {len(merged)} unique firms into {output_csv}")
-        return
+        print(f"[MERGE] Merged {written} unique firms into {dest}")
+        if return_rows:
+            return [row for part in parts for row in part.values.tolist()]
+        return None
 
     # Fallback to pure-CSV handling if pandas is unavailable
-    all_rows: List[dict] = []
+    all_rows: List[List[str]] = []
     websites_seen = set()
+    site = IDX["Website"]
 
     def load(path: str):
         try:
-            with open(path, newline="", encoding="utf-8") as f:
-                reader = csv.DictReader(f)
-                for r in reader:
-                    w = r.get("Website", "").strip().lower()
-                    if not w:
-                        continue
-                    if w in websites_seen:
-                        continue
-                    websites_seen.add(w)
-                    all_rows.append(r)
+            rows = read_rows(path)
         except FileNotFoundError:
             print(f"[MERGE] File not found, skipping: {path}")
+            return
+        for r in rows:
+            w = canon_url(r[site])
+            if not w:
+                continue
+            if w in websites_seen:
+                continue
+            websites_seen.add(w)
+            all_rows.append(r)
 
     load(search_csv)
     load(conf_csv)
@@ -1445,25 +2397,120 @@ def merge_raw_sources(
         all_rows = all_rows[:max_total_rows]
         print(f"[MERGE] Truncated merged rows to {max_total_rows} per max_total_rows limit.")
 
-    with open(output_csv, "w", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        writer.writeheader()
-        writer.writerows(all_rows)
+    if output_csv is not None:
+        write_rows(output_csv, all_rows)
+    print(f"[MERGE] Merged {len(all_rows)} unique firms into {dest}")
+    return all_rows if return_rows else None
+
 
-    print(f"[MERGE] Merged {len(all_rows)} unique firms into {output_csv}")
+def merge_and_enrich(
+    search_csv: str, conf_csv: str, dir_csv: str, output_csv: str, max_total_rows: int = None,
+    chunk_size: Optional[int] = None,
+) -> None:
+    """merge_raw_sources() handing its rows straight to enrich(); no merged file is written."""
+    rows = merge_raw_sources(search_csv, conf_csv, dir_csv, output_csv=None,
+                             max_total_rows=max_total_rows, return_rows=True, chunk_size=chunk_size)
+    if rows:
+        enrich(rows, output_csv, chunk_size=chunk_size)
 
 
 # ===============================
 # MAIN ORCHESTRATION
 # ===============================
 
-def main():
+# File extension for the hand-offs between stages; the enriched output is always CSV.
+INTERMEDIATE_EXTS = {"csv": ".csv", "csv.gz": ".csv.gz", "parquet": ".parquet"}
+
+
+def _parse_cap(value: Optional[int]) -> Optional[int]:
+    """Row-cap CLI values: None or <=0 means unlimited (None)."""
+    return None if value is None or value <= 0 else value
+
+
+# One JSON line per stage run: {"stage", "sec", "max_rss_kb"}.
+TIMINGS_PATH = "data/timings.jsonl"
+
+
+def _max_rss_kb() -> Optional[int]:
+    """Peak RSS of this process in KiB; ru_maxrss is KiB on Linux but bytes on macOS."""
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss // 1024 if sys.platform == "darwin" else rss
+
+
+@contextlib.contextmanager
+def _timed(name: str, log_path: str = TIMINGS_PATH):
+    """
+    Time the enclosed block and append the result to log_path. max_rss_kb is the
+    process-wide peak so far (stages overlap, so per-stage deltas mean little).
+    """
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        dt = time.perf_counter() - t0
+        rss = _max_rss_kb()
+        print(f"[TIME] {name}: {dt:.2f}s")
+        ensure_dir(log_path)
+        with open(log_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps({"stage": name, "sec": round(dt, 3), "max_rss_kb": rss}) + "\n")
+
+
+@dataclass
+class Stage:
+    name: str                # e.g., "merge"
+    deps: List[str]          # stages whose outputs this one reads
+    fn: Callable[[], None]   # runs the stage; arguments bound up front
+    output: str              # file the stage writes
+    params: dict = field(default_factory=dict)  # arguments that shape the output; a change makes it stale
+
+
+async def run_stages(stages: List[Stage], skip: Set[str] = frozenset(), force: bool = False) -> None:
+    """
+    Run stages as a DAG. Each stage starts once its deps finish, so independent
+    stages overlap (each in a worker thread). A stage is skipped when named in
+    `skip`, or when its output is newer than its deps' outputs and was built
+    with the same params, unless `force`. Params are stamped next to the output.
+    Skipped stages' existing outputs still count as inputs downstream.
+    Every stage that runs is timed into TIMINGS_PATH.
+    """
+    by_name = {stage.name: stage for stage in stages}
+    order = graphlib.TopologicalSorter({stage.name: stage.deps for stage in stages}).static_order()
+    tasks: Dict[str, asyncio.Task] = {}
+
+    async def run(stage: Stage) -> None:
+        await asyncio.gather(*(tasks[dep] for dep in stage.deps))
+        if stage.name in skip:
+            return
+        if not force and _is_fresh(stage.output, *(by_name[dep].output for dep in stage.deps),
+                                   params=stage.params):
+            _skip_fresh(stage.output)
+            return
+        before = os.path.getmtime(stage.output) if os.path.exists(stage.output) else None
+        with _timed(stage.name):
+            await asyncio.to_thread(stage.fn)
+        # A stage that wrote nothing leaves any older output unstamped, so it stays stale.
+        if os.path.exists(stage.output) and os.path.getmtime(stage.output) != before:
+            _write_stamp(stage.output, stage.params)
+
+    # Topological order guarantees every dep's task exists before its dependents'.
+    for name in order:
+        tasks[name] = asyncio.create_task(run(by_name[name]))
+    await asyncio.gather(*tasks.values())
+
+
+async def main():
     """
     High-level flow:
-        1) Discover via search -> data/firms_raw_search.csv
-        2) Discover via conferences -> data/firms_raw_conferences.csv
-        3) Merge -> data/firms_raw_all.csv
-        4) Enrich -> data/firms_enriched.csv
+        1) Discover via search, conferences, and directories concurrently
+           -> data/firms_raw_{search,conferences,directories}.csv
+        2) Merge -> data/firms_raw_all.csv (only with --keep-intermediate or
+           --skip-enrich; otherwise the rows go to enrichment in memory)
+        3) Enrich -> data/firms_enriched.csv
+    Stages whose output is newer than their inputs and was built with the same
+    row caps are skipped unless --force.
+    With --format csv.gz or parquet, the raw and merged files use that format.
     """
     parser = argparse.ArgumentParser(description="Discover, merge, and enrich firms.")
     parser.add_argument("--max-search-rows", type=int, default=10,
@@ -1484,42 +2531,88 @@ def main():
                         help="Skip directory scraping.")
     parser.add_argument("--skip-enrich", action="store_true",
                         help="Skip enrichment step.")
+    parser.add_argument("--force", action="store_true",
+                        help="Re-run every stage even if its output is newer than its inputs.")
+    parser.add_argument("--chunk-size", type=int, default=0,
+                        help="Rows per chunk when merging and enriching (<=0 picks one from input size). "
+                             "Larger chunks mean more throughput but more memory.")
+    parser.add_argument("--keep-intermediate", action="store_true",
+                        help="Write the merged file even when enrichment could take the rows in memory.")
+    parser.add_argument("--format", choices=sorted(INTERMEDIATE_EXTS), default="csv",
+                        help="File format for intermediate stage outputs; csv.gz is gzip level 1, parquet needs pandas plus pyarrow or fastparquet.")
     args = parser.parse_args()
-
-    max_search = None if (args.max_search_rows is not None and args.max_search_rows <= 0) else args.max_search_rows
-    max_conf = None if (args.max_conf_rows is not None and args.max_conf_rows <= 0) else args.max_conf_rows
-    max_dir = None if (args.max_dir_rows is not None and args.max_dir_rows <= 0) else args.max_dir_rows
-
-    if not args.skip_search:
-        run_search_discovery(
-            output_csv="data/firms_raw_search.csv",
-            max_rows=max_search,
-        )
-
-    if not args.skip_conferences:
-        run_conference_scrape(
-            output_csv="data/firms_raw_conferences.csv",
-            max_rows=max_conf,
-        )
-
-    if not args.skip_directories:
-        run_directory_scrape(
-            output_csv="data/firms_raw_directories.csv",
-            max_rows=max_dir,
-            use_headless=args.headless,
-        )
-
-    merge_raw_sources(
-        search_csv="data/firms_raw_search.csv",
-        conf_csv="data/firms_raw_conferences.csv",
-        dir_csv="data/firms_raw_directories.csv",
-        output_csv="data/firms_raw_all.csv",
-        max_total_rows=None if (args.max_total_rows is not None and args.max_total_rows <= 0) else args.max_total_rows,
+    # Checked up front: to_parquet() would only fail after discovery spent its network time.
+    if args.format == "parquet" and (pd is None or (pa is None and importlib.util.find_spec("fastparquet") is None)):
+        parser.error("--format parquet needs pandas and pyarrow or fastparquet.")
+
+    ext = INTERMEDIATE_EXTS[args.format]
+    search_csv = f"data/firms_raw_search{ext}"
+    conf_csv = f"data/firms_raw_conferences{ext}"
+    dir_csv = f"data/firms_raw_directories{ext}"
+    merged_csv = f"data/firms_raw_all{ext}"
+    enriched_csv = "data/firms_enriched.csv"
+
+    # Fail fast on configurations that could only end in an empty or failed run.
+    if args.skip_search and args.skip_conferences and args.skip_directories and not any(
+        os.path.exists(path) for path in (search_csv, conf_csv, dir_csv, merged_csv)
+    ):
+        parser.error(f"every data source is skipped and there is no existing raw or merged file to reuse ({merged_csv}).")
+    os.makedirs("data", exist_ok=True)
+    if not os.access("data", os.W_OK):
+        parser.error("output directory data/ is not writable.")
+
+    max_search = _parse_cap(args.max_search_rows)
+    max_conf = _parse_cap(args.max_conf_rows)
+    max_dir = _parse_cap(args.max_dir_rows)
+    max_total = _parse_cap(args.max_total_rows)
+    # None lets each stage size chunks from its inputs once they exist.
+    chunk_size = _parse_cap(args.chunk_size)
+
+    # Discovery stages write separate files, so their network waits overlap.
+    # Search and enrich start their own event loops inside their worker threads.
+    stages = [
+        Stage("search", [], functools.partial(
+            run_search_discovery, output_csv=search_csv, max_rows=max_search,
+        ), search_csv, {"max_rows": max_search}),
+        Stage("conferences", [], functools.partial(
+            run_conference_scrape, output_csv=conf_csv, max_rows=max_conf,
+        ), conf_csv, {"max_rows": max_conf}),
+        Stage("directories", [], functools.partial(
+            run_directory_scrape, output_csv=dir_csv, max_rows=max_dir, use_headless=args.headless,
+        ), dir_csv, {"max_rows": max_dir, "headless": args.headless}),
+    ]
+    raw_files = (search_csv, conf_csv, dir_csv)
+    # Merge hands its rows to enrich in-process unless the merged file is wanted,
+    # or is all that's left to enrich from.
+    fuse = not args.skip_enrich and not args.keep_intermediate and not (
+        args.skip_search and args.skip_conferences and args.skip_directories
+        and not any(os.path.exists(path) for path in raw_files)
     )
-
-    if not args.skip_enrich:
-        enrich(input_csv="data/firms_raw_all.csv", output_csv="data/firms_enriched.csv")
+    if fuse:
+        stages.append(Stage("merge_enrich", ["search", "conferences", "directories"], functools.partial(
+            merge_and_enrich, *raw_files, output_csv=enriched_csv, max_total_rows=max_total,
+            chunk_size=chunk_size,
+        ), enriched_csv, {"max_total_rows": max_total}))
+    else:
+        stages += [
+            Stage("merge", ["search", "conferences", "directories"], functools.partial(
+                merge_raw_sources, *raw_files, output_csv=merged_csv, max_total_rows=max_total,
+                chunk_size=chunk_size,
+            ), merged_csv, {"max_total_rows": max_total}),
+            Stage("enrich", ["merge"], functools.partial(
+                enrich, input_csv=merged_csv, output_csv=enriched_csv, chunk_size=chunk_size,
+            ), enriched_csv),
+        ]
+    skip = {
+        name for name, flag in (
+            ("search", args.skip_search),
+            ("conferences", args.skip_conferences),
+            ("directories", args.skip_directories),
+            ("enrich", args.skip_enrich),
+        ) if flag
+    }
+    await run_stages(stages, skip=skip, force=args.force)
 
 
 if __name__ == "__main__":
-    main()
+    asyncio.run(main())